@@ -2,87 +2,140 @@
 
 import pytest
 from fastapi.testclient import TestClient
-import sys
-from pathlib import Path
-import copy
-
-# Add the src directory to the Python path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from functools import lru_cache
+from urllib.parse import quote
 
 import app as app_module
 
+SAMPLE_EMAIL = "test-student@mergington.edu"
 
-@pytest.fixture
-def client():
-    """Create a test client for the FastAPI app with fresh state"""
-    # Reset the activities to initial state for each test
-    initial_activities = {
-        "Basketball Team": {
-            "description": "Join the varsity and JV basketball teams for competitive play",
-            "schedule": "Mondays, Wednesdays, Fridays, 4:00 PM - 5:30 PM",
-            "max_participants": 15,
-            "participants": ["alex@mergington.edu"]
-        },
-        "Volleyball Club": {
-            "description": "Learn volleyball skills and compete in tournaments",
-            "schedule": "Tuesdays and Thursdays, 4:00 PM - 5:30 PM",
-            "max_participants": 18,
-            "participants": ["jordan@mergington.edu"]
-        },
-        "Drama Club": {
-            "description": "Perform in school plays and theatrical productions",
-            "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
-            "max_participants": 25,
-            "participants": ["marcus@mergington.edu", "isabella@mergington.edu"]
-        },
-        "Art Studio": {
-            "description": "Explore painting, drawing, and sculpture techniques",
-            "schedule": "Mondays and Thursdays, 3:30 PM - 4:45 PM",
-            "max_participants": 16,
-            "participants": ["grace@mergington.edu"]
-        },
-        "Debate Team": {
-            "description": "Develop argumentation skills and compete in debates",
-            "schedule": "Tuesdays, 3:30 PM - 5:00 PM",
-            "max_participants": 20,
-            "participants": ["ryan@mergington.edu", "sophia@mergington.edu"]
-        },
-        "Science Club": {
-            "description": "Conduct experiments and explore advanced scientific concepts",
-            "schedule": "Fridays, 3:30 PM - 4:45 PM",
-            "max_participants": 15,
-            "participants": ["ava@mergington.edu"]
-        },
-        "Chess Club": {
-            "description": "Learn strategies and compete in chess tournaments",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 12,
-            "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
-        },
-        "Programming Class": {
-            "description": "Learn programming fundamentals and build software projects",
-            "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
-        },
-        "Gym Class": {
-            "description": "Physical education and sports activities",
-            "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-            "max_participants": 30,
-            "participants": ["john@mergington.edu", "olivia@mergington.edu"]
+
+# Cached so requests don't re-encode the query string on every call
+@lru_cache(maxsize=None)
+def _action_url(action, activity, email):
+    """Build the full, already-encoded URL for a signup/unregister request"""
+    return f"/activities/{quote(activity)}/{action}?email={quote(email)}"
+
+
+def _signup(client, activity="Basketball Team", email=SAMPLE_EMAIL):
+    """Sign a student up for an activity through the API"""
+    return client.post(_action_url("signup", activity, email))
+
+
+def _unregister(client, activity="Basketball Team", email=SAMPLE_EMAIL):
+    """Unregister a student from an activity through the API"""
+    return client.post(_action_url("unregister", activity, email))
+
+
+# Initial activity state restored before each test
+_INITIAL_ACTIVITIES = {
+    "Basketball Team": {
+        "description": "Join the varsity and JV basketball teams for competitive play",
+        "schedule": "Mondays, Wednesdays, Fridays, 4:00 PM - 5:30 PM",
+        "max_participants": 15,
+        "participants": ["alex@mergington.edu"]
+    },
+    "Volleyball Club": {
+        "description": "Learn volleyball skills and compete in tournaments",
+        "schedule": "Tuesdays and Thursdays, 4:00 PM - 5:30 PM",
+        "max_participants": 18,
+        "participants": ["jordan@mergington.edu"]
+    },
+    "Drama Club": {
+        "description": "Perform in school plays and theatrical productions",
+        "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
+        "max_participants": 25,
+        "participants": ["marcus@mergington.edu", "isabella@mergington.edu"]
+    },
+    "Art Studio": {
+        "description": "Explore painting, drawing, and sculpture techniques",
+        "schedule": "Mondays and Thursdays, 3:30 PM - 4:45 PM",
+        "max_participants": 16,
+        "participants": ["grace@mergington.edu"]
+    },
+    "Debate Team": {
+        "description": "Develop argumentation skills and compete in debates",
+        "schedule": "Tuesdays, 3:30 PM - 5:00 PM",
+        "max_participants": 20,
+        "participants": ["ryan@mergington.edu", "sophia@mergington.edu"]
+    },
+    "Science Club": {
+        "description": "Conduct experiments and explore advanced scientific concepts",
+        "schedule": "Fridays, 3:30 PM - 4:45 PM",
+        "max_participants": 15,
+        "participants": ["ava@mergington.edu"]
+    },
+    "Chess Club": {
+        "description": "Learn strategies and compete in chess tournaments",
+        "schedule": "Fridays, 3:30 PM - 5:00 PM",
+        "max_participants": 12,
+        "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
+    },
+    "Programming Class": {
+        "description": "Learn programming fundamentals and build software projects",
+        "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
+        "max_participants": 20,
+        "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
+    },
+    "Gym Class": {
+        "description": "Physical education and sports activities",
+        "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
+        "max_participants": 30,
+        "participants": ["john@mergington.edu", "olivia@mergington.edu"]
+    }
+}
+
+# Activity names the API is expected to expose
+_EXPECTED_ACTIVITIES = frozenset({
+    "Basketball Team",
+    "Volleyball Club",
+    "Drama Club",
+    "Art Studio",
+    "Debate Team",
+    "Science Club",
+    "Chess Club",
+    "Programming Class",
+    "Gym Class"
+})
+
+
+def _fresh_activities():
+    """Build a fresh copy of the initial activities with new participant lists"""
+    return {
+        name: {
+            "description": details["description"],
+            "schedule": details["schedule"],
+            "max_participants": details["max_participants"],
+            "participants": list(details["participants"])
         }
+        for name, details in _INITIAL_ACTIVITIES.items()
     }
-    
-    app_module.activities.clear()
-    app_module.activities.update(copy.deepcopy(initial_activities))
-    
-    return TestClient(app_module.app)
+
+
+def _seed(email, activity="Basketball Team"):
+    """Sign a student up by mutating the in-memory state directly"""
+    app_module.activities[activity]["participants"].append(email)
+
+
+@pytest.fixture(scope="session")
+def _client():
+    """Create a single test client for the FastAPI app, shared by all tests"""
+    # Entering the client runs the app's lifespan startup/shutdown once and
+    # keeps one event loop portal open, so requests don't each start a loop
+    with TestClient(app_module.app) as client:
+        yield client
 
 
 @pytest.fixture
-def sample_email():
-    """Provide a sample email for testing"""
-    return "test-student@mergington.edu"
+def client(_client):
+    """Provide the shared test client with fresh activity state"""
+    # Reset the activities to initial state for each test. Under pytest-xdist
+    # each worker is a separate process with its own copy of app_module, so
+    # this reset stays worker-local.
+    app_module.activities.clear()
+    app_module.activities.update(_fresh_activities())
+    
+    return _client
 
 
 class TestGetActivities:
@@ -101,179 +154,107 @@ class TestGetActivities:
     def test_get_activities_contains_expected_activities(self, client):
         """Test that activities list contains expected activities"""
         response = client.get("/activities")
-        activities = response.json()
-        
-        expected_activities = [
-            "Basketball Team",
-            "Volleyball Club",
-            "Drama Club",
-            "Art Studio",
-            "Debate Team",
-            "Science Club",
-            "Chess Club",
-            "Programming Class",
-            "Gym Class"
-        ]
-        
-        for activity in expected_activities:
-            assert activity in activities
+        assert _EXPECTED_ACTIVITIES.issubset(response.json())
 
     def test_activity_has_required_fields(self, client):
         """Test that each activity has required fields"""
         response = client.get("/activities")
         activities = response.json()
         
-        required_fields = ["description", "schedule", "max_participants", "participants"]
+        required_fields = frozenset({"description", "schedule", "max_participants", "participants"})
         
-        for activity_name, activity_details in activities.items():
-            for field in required_fields:
-                assert field in activity_details, f"Missing {field} in {activity_name}"
+        missing = {
+            activity_name: required_fields - activity_details.keys()
+            for activity_name, activity_details in activities.items()
+            if not required_fields <= activity_details.keys()
+        }
+        assert not missing, f"Missing fields: {missing}"
 
 
-class TestSignup:
-    """Tests for POST /activities/{activity_name}/signup endpoint"""
+class TestMembership:
+    """Tests shared by the signup and unregister endpoints"""
 
-    def test_signup_for_activity_returns_200(self, client, sample_email):
-        """Test that signup returns a 200 status code"""
-        response = client.post(
-            f"/activities/Basketball Team/signup",
-            params={"email": sample_email}
-        )
-        assert response.status_code == 200
+    @pytest.mark.parametrize("action, signed_up, expected_message", [
+        (_signup, False, "Signed up"),
+        (_unregister, True, "Unregistered"),
+    ], ids=["signup", "unregister"])
+    def test_returns_success_message(self, client, action, signed_up, expected_message):
+        """Test that a valid request returns 200 and a success message"""
+        if signed_up:
+            _seed(SAMPLE_EMAIL)
 
-    def test_signup_for_activity_returns_success_message(self, client, sample_email):
-        """Test that signup returns a success message"""
-        response = client.post(
-            f"/activities/Basketball Team/signup",
-            params={"email": sample_email}
-        )
+        response = action(client)
+        assert response.status_code == 200
         data = response.json()
-        assert "message" in data
-        assert sample_email in data["message"]
+        assert expected_message in data["message"]
+        assert SAMPLE_EMAIL in data["message"]
+
+    @pytest.mark.parametrize("action", [_signup, _unregister], ids=["signup", "unregister"])
+    def test_nonexistent_activity_returns_404(self, client, action):
+        """Test that a request for a nonexistent activity returns 404"""
+        response = action(client, "Nonexistent Activity")
+        assert response.status_code == 404
+        assert "Activity not found" in response.json()["detail"]
+
+    @pytest.mark.parametrize("action, signed_up, expected_detail", [
+        (_signup, True, "already signed up"),
+        (_unregister, False, "not signed up"),
+    ], ids=["signup", "unregister"])
+    def test_invalid_membership_change_returns_400(self, client, action, signed_up, expected_detail):
+        """Test that signing up twice or unregistering when not signed up fails"""
+        if signed_up:
+            _seed(SAMPLE_EMAIL)
+
+        response = action(client)
+        assert response.status_code == 400
+        assert expected_detail in response.json()["detail"]
+
+
+class TestSignup:
+    """Tests for POST /activities/{activity_name}/signup endpoint"""
 
-    def test_signup_adds_participant_to_activity(self, client, sample_email):
+    def test_signup_adds_participant_to_activity(self, client):
         """Test that signup adds the participant to the activity"""
         # First, get initial participants
-        response = client.get("/activities")
-        initial_count = len(response.json()["Basketball Team"]["participants"])
+        before = client.get("/activities").json()["Basketball Team"]["participants"]
         
         # Sign up
-        signup_response = client.post(
-            f"/activities/Basketball Team/signup",
-            params={"email": sample_email}
-        )
+        signup_response = _signup(client)
         assert signup_response.status_code == 200
         
         # Check that participant was added
-        response = client.get("/activities")
-        final_count = len(response.json()["Basketball Team"]["participants"])
-        assert final_count == initial_count + 1
-        assert sample_email in response.json()["Basketball Team"]["participants"]
-
-    def test_signup_for_nonexistent_activity_returns_404(self, client, sample_email):
-        """Test that signup for a nonexistent activity returns 404"""
-        response = client.post(
-            f"/activities/Nonexistent Activity/signup",
-            params={"email": sample_email}
-        )
-        assert response.status_code == 404
-        assert "Activity not found" in response.json()["detail"]
-
-    def test_signup_duplicate_fails(self, client, sample_email):
-        """Test that signing up twice for the same activity fails"""
-        # Sign up for the first time
-        response1 = client.post(
-            f"/activities/Basketball Team/signup",
-            params={"email": sample_email}
-        )
-        assert response1.status_code == 200
-        
-        # Try to sign up again
-        response2 = client.post(
-            f"/activities/Basketball Team/signup",
-            params={"email": sample_email}
-        )
-        assert response2.status_code == 400
-        assert "already signed up" in response2.json()["detail"]
+        after = client.get("/activities").json()["Basketball Team"]["participants"]
+        assert len(after) == len(before) + 1
+        assert SAMPLE_EMAIL in after
 
 
 class TestUnregister:
     """Tests for POST /activities/{activity_name}/unregister endpoint"""
 
-    def test_unregister_from_activity_returns_200(self, client, sample_email):
-        """Test that unregister returns a 200 status code"""
-        # First sign up
-        client.post(
-            f"/activities/Basketball Team/signup",
-            params={"email": sample_email}
-        )
-        
-        # Then unregister
-        response = client.post(
-            f"/activities/Basketball Team/unregister",
-            params={"email": sample_email}
-        )
-        assert response.status_code == 200
-
-    def test_unregister_from_activity_returns_success_message(self, client, sample_email):
-        """Test that unregister returns a success message"""
-        # Sign up first
-        client.post(
-            f"/activities/Basketball Team/signup",
-            params={"email": sample_email}
-        )
-        
-        # Unregister
-        response = client.post(
-            f"/activities/Basketball Team/unregister",
-            params={"email": sample_email}
-        )
-        data = response.json()
-        assert "message" in data
-        assert sample_email in data["message"]
-
-    def test_unregister_removes_participant_from_activity(self, client, sample_email):
+    def test_unregister_removes_participant_from_activity(self, client):
         """Test that unregister removes the participant from the activity"""
-        # Sign up
-        client.post(
-            f"/activities/Basketball Team/signup",
-            params={"email": sample_email}
-        )
+        _seed(SAMPLE_EMAIL)
         
-        # Get count before unregister
-        response = client.get("/activities")
-        count_before = len(response.json()["Basketball Team"]["participants"])
+        # Get participants before unregister
+        before = client.get("/activities").json()["Basketball Team"]["participants"]
         
         # Unregister
-        unregister_response = client.post(
-            f"/activities/Basketball Team/unregister",
-            params={"email": sample_email}
-        )
+        unregister_response = _unregister(client)
         assert unregister_response.status_code == 200
         
         # Check that participant was removed
-        response = client.get("/activities")
-        count_after = len(response.json()["Basketball Team"]["participants"])
-        assert count_after == count_before - 1
-        assert sample_email not in response.json()["Basketball Team"]["participants"]
-
-    def test_unregister_from_nonexistent_activity_returns_404(self, client, sample_email):
-        """Test that unregister from a nonexistent activity returns 404"""
-        response = client.post(
-            f"/activities/Nonexistent Activity/unregister",
-            params={"email": sample_email}
-        )
-        assert response.status_code == 404
-        assert "Activity not found" in response.json()["detail"]
+        after = client.get("/activities").json()["Basketball Team"]["participants"]
+        assert len(after) == len(before) - 1
+        assert SAMPLE_EMAIL not in after
 
-    def test_unregister_when_not_signed_up_fails(self, client, sample_email):
-        """Test that unregistering when not signed up fails"""
-        response = client.post(
-            f"/activities/Basketball Team/unregister",
-            params={"email": sample_email}
-        )
-        assert response.status_code == 400
-        assert "not signed up" in response.json()["detail"]
+    def test_signup_then_unregister(self, client):
+        """Test that a student who signed up through the API can unregister"""
+        signup_response = _signup(client)
+        assert signup_response.status_code == 200
+
+        unregister_response = _unregister(client)
+        assert unregister_response.status_code == 200
+        assert SAMPLE_EMAIL not in app_module.activities["Basketball Team"]["participants"]
 
 
 class TestRootEndpoint: